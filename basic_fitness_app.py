@@ -5,7 +5,18 @@ A simple fitness app storing exercises with reps and sets
 
 #--- Imports ---#
 
+import argparse
+import hashlib
+import json
+import os
 import sqlite3
+import sys
+import threading
+from bisect import bisect_left, bisect_right, insort
+from collections import Counter, OrderedDict
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlparse
 
 from tabulate import tabulate #for viewing if only using terminal
 
@@ -40,6 +51,26 @@ if not cursor.fetchone():
 
     db.commit()
 
+# Append-only journal of every change, see the Change Journal section. It has its own file so
+# journaling routine and goal changes doesn't touch workout_db, which versions the exercises.
+cursor.execute("ATTACH DATABASE 'data/change_log.db' AS journal")
+cursor.execute('''
+    CREATE TABLE IF NOT EXISTS journal.change_log (
+        Seq INTEGER PRIMARY KEY AUTOINCREMENT,
+        Entity TEXT,
+        Operation TEXT,
+        Key TEXT,
+        Data TEXT,
+        Timestamp TEXT DEFAULT CURRENT_TIMESTAMP
+    )
+    ''')
+for statement in ('UPDATE', 'DELETE'):
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS journal.change_log_no_{statement.lower()} BEFORE {statement} ON change_log
+        BEGIN SELECT RAISE(ABORT, 'change_log is append-only'); END
+        ''')
+db.commit()
+
 
 routine_db = sqlite3.connect('data/routine_db.db')
 
@@ -100,6 +131,149 @@ def get_goal_data_for_exercises(routine_name, db):
 
     return goal_data
 
+# Used in view_exercise_progress and batch mode
+def calculate_exercise_progress(completed_reps, total_reps, total_sets):
+    """
+    Works out the remaining sets/reps and percentage completion of an exercise, based on reps.
+
+    Returns:
+        tuple: (remaining sets, remaining reps, completion percentage)
+    """
+
+    remaining_reps = total_reps - completed_reps
+    remaining_sets = int(remaining_reps / total_reps * total_sets) + 1 if remaining_reps % total_reps > 0 else 0
+    completion_percentage = round((completed_reps / total_reps) * 100, 2)
+    return remaining_sets, remaining_reps, completion_percentage
+
+# Used in view_exercise_progress and batch mode
+def calculate_overall_completion(progress):
+    """
+    Works out the overall workout completion from the completed share of every set and rep.
+
+    Args:
+        progress (list): (completed reps, total reps, total sets) for each exercise.
+
+    Returns:
+        float: The overall completion percentage, or None if there are no exercises.
+    """
+
+    if not progress:
+        return None
+    total_completion = sum(completed_reps / (total_sets * total_reps) for completed_reps, total_reps, total_sets in progress)
+    return round(total_completion / len(progress) * 100, 2)
+
+#--- Entity Versions ---#
+# Used by the HTTP service to know when a cached response is stale
+
+entity_db_paths = {
+    'exercises': 'data/workout_db.db',
+    'routines': 'data/routine_db.db',
+    'goals': 'data/goals.db'}
+
+entity_versions = {entity: 0 for entity in entity_db_paths}
+version_lock = threading.Lock()
+
+def bump_entity_version(entity):
+    """
+    Marks an entity as changed after a commit made by this process.
+    """
+
+    with version_lock:
+        entity_versions[entity] += 1
+
+def get_entity_version(entity):
+    """
+    Returns the current version of an entity without querying SQLite.
+
+    The in-process counter covers changes made here, the file modification time
+    covers changes committed by another process (e.g. the menu running separately).
+
+    Returns:
+        tuple: (counter, modification time in ns) for the entity's database file.
+    """
+
+    with version_lock:
+        counter = entity_versions[entity]
+    try:
+        mtime = os.stat(entity_db_paths[entity]).st_mtime_ns
+    except OSError:
+        mtime = 0
+    return (counter, mtime)
+
+#--- Change Journal ---#
+# Every change is appended to change_log in change_log.db with an increasing sequence number,
+# so caches and exports can catch up with get_changes_since instead of re-reading every table.
+#   exercises: insert / delete, keyed by exercise
+#   routines:  create / insert / delete / drop, keyed by routine
+#   goals:     set / delete, keyed by exercise
+
+def record_change(conn, entity, operation, key, data=None):
+    """
+    Appends a change to the journal. Does not commit, so the entry is committed together
+    with the change on db or a connect_all_databases() connection, which have it attached.
+    """
+
+    conn.execute("INSERT INTO journal.change_log (Entity, Operation, Key, Data) VALUES (?, ?, ?, ?)",
+                 (entity, operation, key, json.dumps(data) if data is not None else None))
+
+def get_changes_since(seq=0, limit=None, conn=None):
+    """
+    Returns the changes made after sequence number seq, oldest first.
+
+    Args:
+        seq (int, optional): The last sequence number the consumer has seen. Defaults to 0, everything.
+        limit (int, optional): Maximum number of changes to return, at least 1. Defaults to None, no limit.
+        conn (sqlite3.Connection, optional): Connection to change_log.db to read with. Defaults to a new one.
+
+    Returns:
+        list: Dicts with the 'seq', 'entity', 'operation', 'key', 'data' and 'timestamp' of each change.
+    """
+
+    # SQLite treats a negative LIMIT as no limit at all
+    if limit is not None and limit <= 0:
+        raise ValueError("limit must be a positive integer")
+
+    sql = '''
+        SELECT Seq, Entity, Operation, Key, Data, Timestamp FROM change_log
+        WHERE Seq > ? ORDER BY Seq LIMIT ?
+        '''
+    params = (seq, limit if limit is not None else -1)
+    rows = conn.execute(sql, params).fetchall() if conn else query_db('data/change_log.db', sql, params)
+
+    return [{'seq': change_seq, 'entity': entity, 'operation': operation, 'key': key,
+             'data': json.loads(data) if data is not None else None, 'timestamp': timestamp}
+            for change_seq, entity, operation, key, data, timestamp in rows]
+
+def get_latest_change_seq(conn=None):
+    """
+    Returns the sequence number of the newest change, or 0 if nothing has been journaled yet.
+    """
+
+    sql = "SELECT COALESCE(MAX(Seq), 0) FROM change_log"
+    return (conn.execute(sql).fetchall() if conn else query_db('data/change_log.db', sql))[0][0]
+
+def get_changes_page(seq=0, limit=None):
+    """
+    Returns the changes made after seq and the sequence number to poll from next.
+
+    Both are read in one transaction, so a change committed in between can't move the
+    head past an entry the consumer was never given.
+
+    Returns:
+        tuple: (changes as returned by get_changes_since, latest sequence number).
+    """
+
+    conn = sqlite3.connect('data/change_log.db')
+    try:
+        conn.execute("BEGIN")
+        changes = get_changes_since(seq, limit, conn)
+        # An empty page means nothing newer than seq exists, so the head can't skip anything
+        latest_seq = changes[-1]['seq'] if changes else get_latest_change_seq(conn)
+        conn.rollback()
+    finally:
+        conn.close()
+    return changes, latest_seq
+
 #--- Add Exercise ---#
 
 def add_exercise_category():
@@ -133,7 +307,11 @@ def add_exercise_category():
         # Use a parameterized query to prevent SQL injection
         sql_insert = "INSERT INTO program (Exercise, Muscle_Group, Reps, Sets) VALUES (?, ?, ?, ?)"
         cursor.execute(sql_insert, (new_exercise_name, new_muscle, new_reps, new_sets))
+        record_change(db, 'exercises', 'insert', new_exercise_name,
+                      {'muscle_group': new_muscle, 'reps': new_reps, 'sets': new_sets})
         db.commit()
+        bump_entity_version('exercises')
+        add_to_exercise_catalog(new_exercise_name, new_muscle, new_reps, new_sets)
         print("Exercise added successfully!")
 
     except (KeyboardInterrupt, ValueError):  # Catch cancellation or invalid input
@@ -216,14 +394,397 @@ def delete_exercise_category():
     
     confirmation = input(f"Are you sure you want to delete '{delete_exercise}'? (y/n): ")
     if confirmation.lower() == 'y':
-        # Use a parameterized query to prevent SQL injection
-        sql_del = "DELETE FROM program WHERE Exercise = ?"
-        cursor.execute(sql_del, (delete_exercise,))
-        db.commit()
+        # Also removes the exercise from every routine and its goal
+        try:
+            removed_from_routines, goal_removed = delete_exercise_cascade(delete_exercise)
+        except sqlite3.Error as e:
+            print(f"Error deleting exercise: {e}")
+            return
+
+        bump_entity_version('exercises')
+        remove_from_exercise_catalog(delete_exercise)
+        if removed_from_routines:
+            bump_entity_version('routines')
+            for routine_name, rows in removed_from_routines.items():
+                for exercise_data in rows:
+                    remove_from_routine_volume(routine_name, *exercise_data)
+        if goal_removed:
+            bump_entity_version('goals')
+
         print(f"Exercise '{delete_exercise}' has been deleted successfully.")
+        if removed_from_routines:
+            print(f"It was also removed from the routines: {', '.join(removed_from_routines)}")
+        if goal_removed:
+            print("Its fitness goal has also been deleted.")
     else:
         print("Deletion cancelled.")
 
+#--- Referential Integrity ---#
+# Exercises, routines and goals live in separate database files and every routine is its own
+# table, so SQLite foreign keys cannot reference program. Instead all three files are attached
+# to one connection: deletes cascade in a single transaction and orphans are found with joins.
+
+CONSISTENCY_CHUNK_SIZE = 200
+
+# Where the incremental checker carries on from: [table, last rowid checked]
+consistency_position = [None, 0]
+consistency_lock = threading.Lock()
+
+def connect_all_databases():
+    """
+    Opens a connection to workout_db with the routine, goal and change journal databases
+    attached as 'routines', 'goals' and 'journal', so one transaction can span all the files.
+    """
+
+    conn = sqlite3.connect('data/workout_db.db')
+    conn.execute("ATTACH DATABASE 'data/routine_db.db' AS routines")
+    conn.execute("ATTACH DATABASE 'data/goals.db' AS goals")
+    conn.execute("ATTACH DATABASE 'data/change_log.db' AS journal")
+    return conn
+
+@contextmanager
+def all_databases_transaction():
+    """
+    Runs the block in one transaction on a connect_all_databases() connection, so a change
+    and its journal entry are committed together, or not at all if an error is raised.
+    """
+
+    conn = connect_all_databases()
+    try:
+        # Explicit, otherwise CREATE and DROP TABLE would be committed on their own
+        conn.execute("BEGIN")
+        yield conn
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+def get_dependent_tables(conn):
+    """
+    Returns the qualified names of every table whose Exercise column must exist in program.
+    """
+
+    tables = [f"routines.{row[0]}" for row in
+              conn.execute("SELECT name FROM routines.sqlite_master WHERE type='table' AND name NOT LIKE 'sqlite_%' ORDER BY name")]
+    # The goals table is only created on the first call to set_fitness_goals
+    if conn.execute("SELECT 1 FROM goals.sqlite_master WHERE type='table' AND name='goals'").fetchone():
+        tables.insert(0, "goals.goals")
+    return tables
+
+def delete_exercise_cascade(exercise):
+    """
+    Deletes an exercise together with its routine entries and goal (ON DELETE CASCADE).
+
+    Args:
+        exercise (str): The exercise name as stored in the program table.
+
+    Returns:
+        tuple: ({routine name: removed (Exercise, Muscle_Group, Reps, Sets) rows}, whether a goal was removed)
+    """
+
+    removed_from_routines = {}
+    goal_removed = False
+
+    with all_databases_transaction() as conn:
+        if conn.execute("DELETE FROM main.program WHERE Exercise = ?", (exercise,)).rowcount:
+            record_change(conn, 'exercises', 'delete', exercise)
+
+        for table in get_dependent_tables(conn):
+            if table == "goals.goals":
+                goal_removed = conn.execute("DELETE FROM goals.goals WHERE Exercise = ?", (exercise,)).rowcount > 0
+                if goal_removed:
+                    record_change(conn, 'goals', 'delete', exercise)
+                continue
+
+            rows = conn.execute(f"SELECT Exercise, Muscle_Group, Reps, Sets FROM {table} WHERE Exercise = ?", (exercise,)).fetchall()
+            if rows:
+                routine_name = table.split('.', 1)[1]
+                conn.execute(f"DELETE FROM {table} WHERE Exercise = ?", (exercise,))
+                record_change(conn, 'routines', 'delete', routine_name, {'exercise': exercise})
+                removed_from_routines[routine_name] = rows
+
+    return removed_from_routines, goal_removed
+
+def check_consistency(repair=True, chunk_size=CONSISTENCY_CHUNK_SIZE, max_chunks=None):
+    """
+    Finds (and optionally deletes) routine entries and goals whose exercise is no longer in program.
+
+    Tables are scanned by rowid in chunks of chunk_size rows, each chunk being its own short
+    read and repair, so the checker can run alongside normal use without holding long locks.
+
+    Args:
+        repair (bool, optional): Delete the orphans that are found. Defaults to True.
+        chunk_size (int, optional): Rows read per chunk. Defaults to CONSISTENCY_CHUNK_SIZE.
+        max_chunks (int, optional): Check at most this many chunks, carrying on from where the
+            previous incremental call stopped. Defaults to None, a full pass from the start.
+
+    Returns:
+        dict: 'orphans' found as (table, exercise) tuples, number of 'repaired' rows,
+        number of rows 'checked' and 'pass_complete', True once every table has been checked.
+    """
+
+    report = {'orphans': [], 'repaired': 0, 'checked': 0, 'pass_complete': False}
+
+    conn = connect_all_databases()
+    try:
+        with consistency_lock:
+            table, last_rowid = consistency_position if max_chunks is not None else (None, 0)
+            tables = get_dependent_tables(conn)
+            chunks = 0
+
+            while max_chunks is None or chunks < max_chunks:
+                # Tables may have been added or dropped since the last call, so find our place by name
+                i = bisect_left(tables, table) if table else 0
+                if i == len(tables):
+                    report['pass_complete'] = True
+                    table, last_rowid = None, 0
+                    break
+                if tables[i] != table:
+                    table, last_rowid = tables[i], 0
+
+                rows = conn.execute(f'''
+                    SELECT t.rowid, t.Exercise, p.Exercise IS NULL
+                    FROM {table} AS t LEFT JOIN main.program AS p ON p.Exercise = t.Exercise
+                    WHERE t.rowid > ? ORDER BY t.rowid LIMIT ?
+                ''', (last_rowid, chunk_size)).fetchall()
+                chunks += 1
+                report['checked'] += len(rows)
+
+                orphan_rowids = [rowid for rowid, exercise, orphan in rows if orphan]
+                report['orphans'].extend((table, exercise) for rowid, exercise, orphan in rows if orphan)
+
+                if repair and orphan_rowids:
+                    deleted = 0
+                    for exercise in set(exercise for rowid, exercise, orphan in rows if orphan):
+                        # Re-check in the delete itself in case the exercise was added back meanwhile
+                        exercise_deleted = conn.execute(f'''
+                            DELETE FROM {table} WHERE rowid IN ({', '.join('?' * len(orphan_rowids))}) AND Exercise IS ?
+                            AND NOT EXISTS (SELECT 1 FROM main.program WHERE main.program.Exercise = {table}.Exercise)
+                        ''', (*orphan_rowids, exercise)).rowcount
+                        if exercise_deleted:
+                            deleted += exercise_deleted
+                            if table == "goals.goals":
+                                record_change(conn, 'goals', 'delete', exercise)
+                            else:
+                                record_change(conn, 'routines', 'delete', table.split('.', 1)[1], {'exercise': exercise})
+                    conn.commit()
+
+                    if deleted:
+                        report['repaired'] += deleted
+                        if table == "goals.goals":
+                            bump_entity_version('goals')
+                        else:
+                            bump_entity_version('routines')
+
+                if len(rows) < chunk_size:
+                    # Finished this table, the name sorts just after it so the next lookup moves on
+                    table, last_rowid = tables[i] + '\0', 0
+                else:
+                    last_rowid = rows[-1][0]
+
+            if max_chunks is not None:
+                consistency_position[:] = [table, last_rowid]
+
+    finally:
+        conn.close()
+
+    return report
+
+def start_consistency_checker(interval=1.0, chunk_size=CONSISTENCY_CHUNK_SIZE):
+    """
+    Repairs orphans on a background thread, one chunk every interval seconds.
+
+    Returns:
+        threading.Event: Set it to stop the checker.
+    """
+
+    stop = threading.Event()
+
+    def run():
+        while not stop.wait(interval):
+            try:
+                check_consistency(chunk_size=chunk_size, max_chunks=1)
+            except sqlite3.Error:
+                # Most likely a busy database, try again on the next tick
+                pass
+
+    threading.Thread(target=run, daemon=True).start()
+    return stop
+
+#--- Routine Balance Recommender ---#
+# Volume (reps x sets) per muscle group is kept for each routine and updated as exercises
+# are added or removed, so suggestions don't rescan the routine or the program table.
+# Both caches remember the entity version they were built at and are rebuilt when a change
+# made elsewhere (another process, batch mode, the consistency checker) moves it on.
+
+routine_volumes = {}            # routine name -> {muscle group: volume}
+routine_exercises = {}          # routine name -> Counter of exercises in the routine
+routine_volumes_version = None
+exercise_catalog = None         # muscle group -> [(volume, exercise)] sorted by volume
+exercise_catalog_index = {}     # exercise -> (muscle group, volume)
+exercise_catalog_version = None
+
+def can_update_cache(cached_version, entity):
+    """
+    Returns True when the cache was current before the change this process has just
+    committed and bumped, so the change can be applied to it instead of rebuilding.
+
+    Only the in-process counter can be checked, a change committed by another process
+    in the meantime is picked up by the next change to its database file.
+    """
+
+    return cached_version is not None and get_entity_version(entity)[0] - cached_version[0] <= 1
+
+def get_exercise_catalog():
+    """
+    Returns the program catalog indexed by muscle group, reading the table again only when it has changed.
+    """
+
+    global exercise_catalog, exercise_catalog_version
+    version = get_entity_version('exercises')
+    if exercise_catalog is None or version != exercise_catalog_version:
+        exercise_catalog = {group: [] for group in muscle_group_options}
+        exercise_catalog_index.clear()
+        for exercise, muscle_group, reps, sets in db.execute("SELECT * FROM program").fetchall():
+            exercise_catalog.setdefault(muscle_group, []).append((reps * sets, exercise))
+            exercise_catalog_index[exercise] = (muscle_group, reps * sets)
+        for group_exercises in exercise_catalog.values():
+            group_exercises.sort()
+        exercise_catalog_version = version
+    return exercise_catalog
+
+def add_to_exercise_catalog(exercise, muscle_group, reps, sets):
+    global exercise_catalog, exercise_catalog_version
+    if not can_update_cache(exercise_catalog_version, 'exercises'):
+        exercise_catalog = None  # Rebuilt on next use
+        return
+
+    insort(exercise_catalog.setdefault(muscle_group, []), (reps * sets, exercise))
+    exercise_catalog_index[exercise] = (muscle_group, reps * sets)
+    exercise_catalog_version = get_entity_version('exercises')
+
+def remove_from_exercise_catalog(exercise):
+    global exercise_catalog, exercise_catalog_version
+    if not can_update_cache(exercise_catalog_version, 'exercises'):
+        exercise_catalog = None
+        return
+
+    if exercise in exercise_catalog_index:
+        muscle_group, volume = exercise_catalog_index.pop(exercise)
+        group_exercises = exercise_catalog[muscle_group]
+        del group_exercises[bisect_left(group_exercises, (volume, exercise))]
+    exercise_catalog_version = get_entity_version('exercises')
+
+def get_routine_volume(routine_name):
+    """
+    Returns the muscle group volume vector for a routine, building it from the table when needed.
+    """
+
+    global routine_volumes_version
+    version = get_entity_version('routines')
+    if version != routine_volumes_version:
+        routine_volumes.clear()
+        routine_exercises.clear()
+        routine_volumes_version = version
+
+    if routine_name not in routine_volumes:
+        volume = dict.fromkeys(muscle_group_options, 0)
+        exercises = Counter()
+        for exercise, muscle_group, reps, sets in routine_db.execute(f"SELECT * FROM {routine_name}").fetchall():
+            volume[muscle_group] = volume.get(muscle_group, 0) + reps * sets
+            exercises[exercise] += 1
+        routine_volumes[routine_name] = volume
+        routine_exercises[routine_name] = exercises
+    return routine_volumes[routine_name]
+
+def update_routine_volume(routine_name, exercise, muscle_group, volume_change, count_change):
+    global routine_volumes_version
+    if not can_update_cache(routine_volumes_version, 'routines'):
+        forget_routine_volumes()
+        return
+
+    # Routines not loaded yet will be built from their table on first use
+    if routine_name in routine_volumes:
+        volume = routine_volumes[routine_name]
+        volume[muscle_group] = volume.get(muscle_group, 0) + volume_change
+        routine_exercises[routine_name][exercise] += count_change
+        if routine_exercises[routine_name][exercise] <= 0:
+            del routine_exercises[routine_name][exercise]
+    routine_volumes_version = get_entity_version('routines')
+
+def add_to_routine_volume(routine_name, exercise, muscle_group, reps, sets):
+    update_routine_volume(routine_name, exercise, muscle_group, reps * sets, 1)
+
+def remove_from_routine_volume(routine_name, exercise, muscle_group, reps, sets):
+    update_routine_volume(routine_name, exercise, muscle_group, -reps * sets, -1)
+
+def forget_routine_volumes():
+    global routine_volumes_version
+    routine_volumes.clear()
+    routine_exercises.clear()
+    routine_volumes_version = None
+
+def find_closest_exercise(group_exercises, gap, in_routine):
+    """
+    Returns the (volume, exercise) from a volume-sorted list that best fills gap, skipping
+    exercises already in the routine, or None if every exercise is already in it.
+    """
+
+    i = bisect_right(group_exercises, (gap, chr(0x10ffff)))
+
+    # Walk outwards from the insertion point, no copies of the list
+    below = above = None
+    for j in range(i - 1, -1, -1):
+        if group_exercises[j][1] not in in_routine:
+            below = group_exercises[j]
+            break
+    for j in range(i, len(group_exercises)):
+        if group_exercises[j][1] not in in_routine:
+            above = group_exercises[j]
+            break
+
+    candidates = [entry for entry in (below, above) if entry]
+    return min(candidates, key=lambda entry: abs(gap - entry[0])) if candidates else None
+
+def recommend_exercises(routine_name, limit=3):
+    """
+    Suggests exercises that bring the routine's muscle groups closer to the most trained one.
+
+    Only groups with less volume than the most trained group are considered (every group
+    while the routine is still even). Each group's best exercise is the one whose reps x sets
+    is closest to the group's gap, and groups are ranked by how little gap that leaves.
+    The catalog is kept sorted by volume, so each group costs one binary search plus
+    skipping exercises already in the routine.
+
+    Args:
+        routine_name (str): The routine (table) to make suggestions for.
+        limit (int, optional): Maximum number of suggestions, one per muscle group. Defaults to 3.
+
+    Returns:
+        list: (exercise, muscle group) tuples, best fit first.
+    """
+
+    volume = get_routine_volume(routine_name)
+    in_routine = routine_exercises[routine_name]
+    catalog = get_exercise_catalog()
+
+    target = max(volume.values(), default=0)
+    groups = [group for group in volume if volume[group] < target] or list(volume)
+
+    ranked = []
+    for group in groups:
+        gap = target - volume[group]
+        best = find_closest_exercise(catalog.get(group, []), gap, in_routine)
+        if best:
+            exercise_volume, exercise = best
+            # Least imbalance left first, then the group furthest behind
+            ranked.append((abs(gap - exercise_volume), -gap, exercise, group))
+
+    ranked.sort()
+    return [(exercise, group) for _, _, exercise, group in ranked[:limit]]
+
 #--- Create Workout Routine ---#
 # A new table should be created for every routine
 def create_workout_routine():
@@ -238,7 +799,8 @@ def create_workout_routine():
 
         # Allow blank name but generate one if user leaves it empty
         if not routine_name:
-            routine_name = f"Routine_{len(r_cursor.execute('SELECT name FROM sqlite_master WHERE type="table"').fetchall()) + 1}"
+            existing_routines = r_cursor.execute("SELECT name FROM sqlite_master WHERE type='table'").fetchall()
+            routine_name = f"Routine_{len(existing_routines) + 1}"
             print(f"No name provided, automatically generated name: {routine_name}")
             break
 
@@ -251,16 +813,29 @@ def create_workout_routine():
 
     table_name = routine_name.replace(" ", "_")  # Sanitize table name
 
-    # Create the routine table
-    r_cursor.execute(f'''
-        CREATE TABLE IF NOT EXISTS {table_name} (
-            Exercise TEXT,
-            Muscle_Group TEXT,
-            Reps INT,
-            Sets INT
-        )
-    ''')
-    routine_db.commit()
+    # Create the routine table, journaled in the same transaction
+    try:
+        with all_databases_transaction() as conn:
+            # Adding to an existing routine is not a new routine. Table names ignore case,
+            # so keep the stored spelling for the journal and the recommender caches
+            routine_exists = conn.execute("SELECT name FROM routines.sqlite_master WHERE type='table' AND name = ? COLLATE NOCASE", (table_name,)).fetchone()
+            if routine_exists:
+                table_name = routine_exists[0]
+            conn.execute(f'''
+                CREATE TABLE IF NOT EXISTS routines.{table_name} (
+                    Exercise TEXT,
+                    Muscle_Group TEXT,
+                    Reps INT,
+                    Sets INT
+                )
+            ''')
+            if not routine_exists:
+                record_change(conn, 'routines', 'create', table_name)
+    except sqlite3.Error as e:
+        print(f"Error creating routine: {e}")
+        return
+    if not routine_exists:
+        bump_entity_version('routines')
 
     # Display exercises from the program table with details
     cursor.execute("SELECT * FROM program")
@@ -271,6 +846,10 @@ def create_workout_routine():
         print(f"\t- {exercise} ({muscle_group}) - Reps: {reps}, Sets: {sets}")
 
     while True:
+        suggestions = recommend_exercises(table_name)
+        if suggestions:
+            print("Suggested to keep muscle groups balanced:", ", ".join(f"{exercise} ({group})" for exercise, group in suggestions))
+
         exercise_to_add = input("Enter an exercise to add (or 'done' to finish): ")
         if exercise_to_add.lower() == 'done':
             break
@@ -280,11 +859,20 @@ def create_workout_routine():
         exercise_data = cursor.fetchone()
         if exercise_data:
             # Insert exercise details into the routine table
-            r_cursor.execute(f'''
-                INSERT INTO {table_name} (Exercise, Muscle_Group, Reps, Sets)
-                VALUES (?, ?, ?, ?)
-            ''', exercise_data)
-            routine_db.commit()
+            exercise, muscle_group, reps, sets = exercise_data
+            try:
+                with all_databases_transaction() as conn:
+                    conn.execute(f'''
+                        INSERT INTO routines.{table_name} (Exercise, Muscle_Group, Reps, Sets)
+                        VALUES (?, ?, ?, ?)
+                    ''', exercise_data)
+                    record_change(conn, 'routines', 'insert', table_name,
+                                  {'exercise': exercise, 'muscle_group': muscle_group, 'reps': reps, 'sets': sets})
+            except sqlite3.Error as e:
+                print(f"Error adding exercise to the routine: {e}")
+                continue
+            bump_entity_version('routines')
+            add_to_routine_volume(table_name, *exercise_data)
             print(f"Exercise '{exercise_to_add}' added to the routine.")
         else:
             print(f"Exercise '{exercise_to_add}' not found in the program database.")
@@ -353,8 +941,15 @@ def delete_workout_routine(cursor):
             table_name = tables[choice-1][0]
             confirmation = input(f"Are you sure you want to delete the routine '{table_name}'? (y/n): ")
             if confirmation.lower() == 'y':
-                cursor.execute(f"DROP TABLE {table_name}")
-                routine_db.commit()
+                try:
+                    with all_databases_transaction() as conn:
+                        conn.execute(f"DROP TABLE routines.{table_name}")
+                        record_change(conn, 'routines', 'drop', table_name)
+                except sqlite3.Error as e:
+                    print(f"Error deleting routine: {e}")
+                    break
+                bump_entity_version('routines')
+                forget_routine_volumes()
                 print(f"Routine '{table_name}' deleted successfully.")
             break
         else:
@@ -411,9 +1006,7 @@ def view_exercise_progress():
             # Calculate remaining sets/reps and percentage completion based on reps
             for exercise, completed in completed_data.items():
                 total = total_data[exercise]
-                remaining_reps = total['reps'] - completed['reps']
-                remaining_sets = int(remaining_reps / total['reps'] * total['sets']) + 1 if remaining_reps % total['reps'] > 0 else 0
-                completion_percentage = round((completed['reps'] / total['reps']) * 100, 2)
+                remaining_sets, remaining_reps, completion_percentage = calculate_exercise_progress(completed['reps'], total['reps'], total['sets'])
 
                 print(f"\n- {exercise}:")
                 print(f"  - Completed: {completed['reps']} reps")
@@ -421,17 +1014,16 @@ def view_exercise_progress():
                 print(f"  - Percentage completion: {completion_percentage}%")
 
             # Calculate and display overall workout progress
-            total_exercises = len(completed_data)
-            total_completion = 0
+            progress = []
             for exercise, completion in completed_data.items():
                 # Ensure valid total data exists for the exercise
                 if exercise in total_data:
-                    total_completion += (completion['reps'] / (total_data[exercise]['sets'] * total_data[exercise]['reps']))
+                    progress.append((completion['reps'], total_data[exercise]['reps'], total_data[exercise]['sets']))
                 else:
                     print(f"Warning: Missing total data for exercise {exercise}. Skipping in overall progress calculation.")
 
-            if total_exercises > 0:  # Avoid division by zero
-                overall_completion = round(total_completion / total_exercises * 100, 2)
+            overall_completion = calculate_overall_completion(progress)
+            if overall_completion is not None:  # Avoid division by zero
                 print("\nOverall Workout Progress:")
                 print(f"- Completed: {overall_completion:.2f}%")
             else:
@@ -525,8 +1117,10 @@ def set_fitness_goals(overwrite_existing=False):
                         if existing_goal:
                             # Update existing goal
                             try:
-                                g_cursor.execute("UPDATE Goals SET GoalValue = ? WHERE Exercise = ?", (goal_reps, selected_exercise))
-                                goals_db.commit()
+                                with all_databases_transaction() as conn:
+                                    conn.execute("UPDATE goals.Goals SET GoalValue = ? WHERE Exercise = ?", (goal_reps, selected_exercise))
+                                    record_change(conn, 'goals', 'set', selected_exercise, {'goal_type': goal_type, 'goal_value': goal_reps})
+                                bump_entity_version('goals')
                                 print(f"Goal updated successfully for {selected_exercise}: {goal_reps} reps!")
                             except sqlite3.IntegrityError as e:
                                 print(f"Error saving goal: {e}")
@@ -535,8 +1129,10 @@ def set_fitness_goals(overwrite_existing=False):
                         else:
                             # Insert new goal
                             try:
-                                g_cursor.execute("INSERT INTO Goals (Exercise, GoalType, GoalValue) VALUES (?, ?, ?)", (selected_exercise, "reps", goal_reps))
-                                goals_db.commit()
+                                with all_databases_transaction() as conn:
+                                    conn.execute("INSERT INTO goals.Goals (Exercise, GoalType, GoalValue) VALUES (?, ?, ?)", (selected_exercise, "reps", goal_reps))
+                                    record_change(conn, 'goals', 'set', selected_exercise, {'goal_type': "reps", 'goal_value': goal_reps})
+                                bump_entity_version('goals')
                                 print(f"Goal set successfully for {selected_exercise}: {goal_reps} reps!")
                             except sqlite3.IntegrityError as e:
                                 print(f"Error saving goal: {e}")
@@ -609,9 +1205,16 @@ def delete_fitness_goals():
       if confirmation.lower() == 'y':
         try:
           # Delete goal from database
-          g_cursor.execute("DELETE FROM Goals WHERE Exercise = ? AND GoalType = ? AND GoalValue = ?", selected_goal)
-          goals_db.commit()
-          print("Goal deleted successfully!")
+          with all_databases_transaction() as conn:
+            deleted = conn.execute("DELETE FROM goals.Goals WHERE Exercise = ? AND GoalType = ? AND GoalValue = ?", selected_goal).rowcount
+            if deleted:
+              record_change(conn, 'goals', 'delete', selected_goal[0])
+          if deleted:
+            bump_entity_version('goals')
+            print("Goal deleted successfully!")
+          else:
+            # Changed or deleted elsewhere since the list was shown
+            print("Goal not found, it may have already been changed or deleted.")
         except Exception as e:
           print(f"Error deleting goal: {e}")
     else:
@@ -696,6 +1299,485 @@ def view_goal_progress():
     except sqlite3.Error as error:
         print("Error occurred:", error)
 
+#--- JSON HTTP Service ---#
+# Read-only JSON endpoints so a front end can be put on the app:
+#   GET /exercises[?muscle_group=legs]
+#   GET /routines
+#   GET /routines/<name>
+#   GET /goals
+#   GET /progress/<exercise>?completed=<reps>
+#   GET /changes?since=<seq>[&limit=<n>]
+
+RESPONSE_CACHE_SIZE = 256
+
+response_cache = OrderedDict()
+response_cache_lock = threading.Lock()
+
+def query_db(db_path, sql, params=()):
+    """
+    Runs a read query on its own connection so it is safe to call from server threads.
+    """
+
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute(sql, params).fetchall()
+    finally:
+        conn.close()
+
+def get_routine_names():
+    rows = query_db('data/routine_db.db', "SELECT name FROM sqlite_master WHERE type='table' AND name NOT LIKE 'sqlite_%'")
+    return [row[0] for row in rows]
+
+def get_goal_rows(sql, params=()):
+    # The goals table is only created on the first call to set_fitness_goals
+    try:
+        return query_db('data/goals.db', sql, params)
+    except sqlite3.OperationalError:
+        return []
+
+def api_exercises(parts, query):
+    if len(parts) != 1:
+        return 404, {'error': 'Not found'}
+
+    if 'muscle_group' in query:
+        rows = query_db('data/workout_db.db', "SELECT * FROM program WHERE Muscle_Group = ?", (query['muscle_group'][0].lower(),))
+    else:
+        rows = query_db('data/workout_db.db', "SELECT * FROM program")
+
+    return 200, [{'exercise': exercise, 'muscle_group': muscle_group, 'reps': reps, 'sets': sets}
+                 for exercise, muscle_group, reps, sets in rows]
+
+def api_routines(parts, query):
+    routine_names = get_routine_names()
+    if len(parts) == 1:
+        return 200, routine_names
+
+    # Table names cannot be parameterised, so only accept existing routines
+    if len(parts) != 2 or parts[1] not in routine_names:
+        return 404, {'error': 'Routine not found'}
+
+    rows = query_db('data/routine_db.db', f"SELECT * FROM {parts[1]}")
+    return 200, {'routine': parts[1],
+                 'exercises': [{'exercise': exercise, 'muscle_group': muscle_group, 'reps': reps, 'sets': sets}
+                               for exercise, muscle_group, reps, sets in rows]}
+
+def api_goals(parts, query):
+    if len(parts) != 1:
+        return 404, {'error': 'Not found'}
+
+    rows = get_goal_rows("SELECT Exercise, GoalType, GoalValue FROM Goals")
+    return 200, [{'exercise': exercise, 'goal_type': goal_type, 'goal_value': goal_value}
+                 for exercise, goal_type, goal_value in rows]
+
+def api_progress(parts, query):
+    """
+    Same calculation as view_goal_progress, with the completed reps taken from the query string.
+    """
+
+    if len(parts) != 2:
+        return 404, {'error': 'Not found'}
+
+    try:
+        completed_reps = int(query.get('completed', ['0'])[0])
+    except ValueError:
+        return 400, {'error': 'completed must be an integer'}
+    if completed_reps < 0:
+        return 400, {'error': 'completed must be a positive integer'}
+
+    goal_data = get_goal_rows("SELECT GoalType, GoalValue FROM Goals WHERE Exercise = ?", (parts[1],))
+    if not goal_data:
+        return 404, {'error': f'No goal set for {parts[1]}'}
+
+    goal_type, goal_value = goal_data[0]
+    return 200, {'exercise': parts[1],
+                 'goal_type': goal_type,
+                 'goal_value': goal_value,
+                 'completed_reps': completed_reps,
+                 'remaining_reps': goal_value - completed_reps,
+                 'completion_percentage': round((completed_reps / goal_value) * 100, 2)}
+
+def api_changes(parts, query):
+    if len(parts) != 1:
+        return 404, {'error': 'Not found'}
+
+    try:
+        since = int(query.get('since', ['0'])[0])
+        limit = int(query['limit'][0]) if 'limit' in query else None
+    except ValueError:
+        return 400, {'error': 'since and limit must be integers'}
+    if limit is not None and limit <= 0:
+        return 400, {'error': 'limit must be a positive integer'}
+
+    # Consumers poll again with since=latest_seq
+    changes, latest_seq = get_changes_page(since, limit)
+    return 200, {'changes': changes, 'latest_seq': latest_seq}
+
+# First path segment -> (entities the response depends on, handler)
+# None means the response is not cached, /changes already only reads the new entries
+api_routes = {
+    'exercises': (('exercises',), api_exercises),
+    'routines': (('routines',), api_routines),
+    'goals': (('goals',), api_goals),
+    'progress': (('goals',), api_progress),
+    'changes': (None, api_changes)}
+
+def get_cached_response(key):
+    with response_cache_lock:
+        cached = response_cache.get(key)
+        if cached is not None:
+            response_cache.move_to_end(key)
+        return cached
+
+def store_cached_response(key, response):
+    with response_cache_lock:
+        response_cache[key] = response
+        response_cache.move_to_end(key)
+        while len(response_cache) > RESPONSE_CACHE_SIZE:
+            response_cache.popitem(last=False)
+
+def etag_matches(if_none_match, etag):
+    if not if_none_match:
+        return False
+    tags = [tag.strip() for tag in if_none_match.split(',')]
+    return '*' in tags or etag in tags or f"W/{etag}" in tags
+
+class FitnessRequestHandler(BaseHTTPRequestHandler):
+    """
+    Serves the api_routes as JSON. Responses are cached by path and entity version,
+    so repeated polling is answered from memory (or with a 304) until the data changes.
+    """
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        parts = [unquote(part) for part in url.path.split('/') if part]
+
+        if not parts or parts[0] not in api_routes:
+            self.send_json(404, json.dumps({'error': 'Not found'}).encode())
+            return
+
+        entities, handler = api_routes[parts[0]]
+        if entities is None:
+            key = cached = None
+        else:
+            # Read the versions before the data so a concurrent write can only make the entry stale, never wrong
+            key = (url.path, url.query, tuple(get_entity_version(entity) for entity in entities))
+            cached = get_cached_response(key)
+
+        if cached is None:
+            try:
+                status, payload = handler(parts, parse_qs(url.query))
+            except sqlite3.Error as error:
+                self.send_json(500, json.dumps({'error': str(error)}).encode())
+                return
+
+            body = json.dumps(payload).encode()
+            if status != 200:
+                self.send_json(status, body)
+                return
+
+            cached = (body, f'"{hashlib.sha1(body).hexdigest()}"')
+            if key is not None:
+                store_cached_response(key, cached)
+
+        body, etag = cached
+        if etag_matches(self.headers.get('If-None-Match'), etag):
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.end_headers()
+            return
+
+        self.send_json(200, body, etag)
+
+    def send_json(self, status, body, etag=None):
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        if etag:
+            self.send_header('ETag', etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # Keep the terminal menu readable while the server runs in the background
+        pass
+
+http_server = None
+
+def start_http_server(port=8000, host='127.0.0.1'):
+    """
+    Starts the JSON HTTP service on a background thread.
+
+    Args:
+        port (int, optional): Port to listen on. 0 picks a free port. Defaults to 8000.
+        host (str, optional): Interface to bind. Defaults to localhost only.
+
+    Returns:
+        ThreadingHTTPServer: The running server, call shutdown() to stop it.
+    """
+
+    server = ThreadingHTTPServer((host, port), FitnessRequestHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+#--- Batch Mode ---#
+# Runs commands from a file or stdin without prompting, one JSON object per line:
+#   {"op": "add-exercise", "exercise": "squat", "muscle_group": "legs", "reps": 10, "sets": 3}
+#   {"op": "create-routine", "routine": "Legs", "exercises": ["squat"]}
+#   {"op": "set-goal", "exercise": "squat", "reps": 100}
+#   {"op": "progress", "exercise": "squat", "completed": 40}
+#   {"op": "progress", "routine": "Legs", "completed": {"squat": 20}}
+# Each command gets one JSON result line on stdout.
+
+BATCH_SIZE = 500
+
+# Largest value SQLite can store in an INTEGER column
+SQLITE_MAX_INTEGER = 2**63 - 1
+
+def get_command_value(command, field):
+    if field not in command:
+        raise ValueError(f"Missing field '{field}'")
+    return command[field]
+
+def get_command_integer(command, field):
+    value = get_command_value(command, field)
+    # bool is a subclass of int, but true/false are not valid reps or sets
+    if not isinstance(value, int) or isinstance(value, bool) or value < 0:
+        raise ValueError(f"'{field}' must be a positive integer")
+    if value > SQLITE_MAX_INTEGER:
+        raise ValueError(f"'{field}' is too large")
+    return value
+
+def batch_add_exercise(conn, command, on_commit):
+    exercise = str(get_command_value(command, 'exercise'))
+    muscle_group = str(get_command_value(command, 'muscle_group')).lower()
+    reps = get_command_integer(command, 'reps')
+    sets = get_command_integer(command, 'sets')
+
+    if not exercise.strip():
+        raise ValueError("Invalid name. Please enter a valid exercise name.")
+    if muscle_group not in muscle_group_options:
+        raise ValueError(f"Invalid muscle group. Choose from: {', '.join(muscle_group_options)}")
+
+    conn.execute("INSERT INTO main.program (Exercise, Muscle_Group, Reps, Sets) VALUES (?, ?, ?, ?)",
+                 (exercise, muscle_group, reps, sets))
+    record_change(conn, 'exercises', 'insert', exercise, {'muscle_group': muscle_group, 'reps': reps, 'sets': sets})
+    on_commit.append(lambda: add_to_exercise_catalog(exercise, muscle_group, reps, sets))
+    return {'exercise': exercise}
+
+def batch_create_routine(conn, command, on_commit):
+    routine_name = str(get_command_value(command, 'routine'))
+    exercises = get_command_value(command, 'exercises')
+
+    # Underscores are allowed so automatically generated names (Routine_1) can be extended
+    if not routine_name.replace('_', '').isalnum():
+        raise ValueError("Invalid routine name. Please use alphanumeric characters only.")
+    if not isinstance(exercises, list):
+        raise ValueError("'exercises' must be a list of exercise names")
+
+    # Look everything up first so a missing exercise doesn't leave a half built routine
+    rows = []
+    for exercise in exercises:
+        exercise_data = conn.execute("SELECT * FROM main.program WHERE LOWER(Exercise) = ?", (str(exercise).lower(),)).fetchone()
+        if not exercise_data:
+            raise ValueError(f"Exercise '{exercise}' not found in the program database.")
+        rows.append(exercise_data)
+
+    # Table names ignore case, an existing routine keeps its stored spelling
+    routine_exists = conn.execute("SELECT name FROM routines.sqlite_master WHERE type='table' AND name = ? COLLATE NOCASE", (routine_name,)).fetchone()
+    if routine_exists:
+        routine_name = routine_exists[0]
+    else:
+        record_change(conn, 'routines', 'create', routine_name)
+    conn.execute(f'''
+        CREATE TABLE IF NOT EXISTS routines.{routine_name} (
+            Exercise TEXT,
+            Muscle_Group TEXT,
+            Reps INT,
+            Sets INT
+        )
+    ''')
+    conn.executemany(f"INSERT INTO routines.{routine_name} (Exercise, Muscle_Group, Reps, Sets) VALUES (?, ?, ?, ?)", rows)
+    for exercise, muscle_group, reps, sets in rows:
+        record_change(conn, 'routines', 'insert', routine_name,
+                      {'exercise': exercise, 'muscle_group': muscle_group, 'reps': reps, 'sets': sets})
+
+    for exercise_data in rows:
+        on_commit.append(lambda exercise_data=exercise_data: add_to_routine_volume(routine_name, *exercise_data))
+    return {'routine': routine_name, 'added': [exercise_data[0] for exercise_data in rows]}
+
+def batch_set_goal(conn, command, on_commit):
+    exercise = str(get_command_value(command, 'exercise'))
+    goal_reps = get_command_integer(command, 'reps')
+
+    if goal_reps == 0:
+        raise ValueError("'reps' must be greater than 0")
+    if not conn.execute("SELECT 1 FROM main.program WHERE Exercise = ?", (exercise,)).fetchone():
+        raise ValueError(f"Exercise '{exercise}' not found in the program database.")
+
+    # Same as set_fitness_goals(overwrite_existing=True)
+    conn.execute("INSERT OR REPLACE INTO goals.Goals (Exercise, GoalType, GoalValue) VALUES (?, ?, ?)",
+                 (exercise, "reps", goal_reps))
+    record_change(conn, 'goals', 'set', exercise, {'goal_type': "reps", 'goal_value': goal_reps})
+    return {'exercise': exercise, 'goal_reps': goal_reps}
+
+def batch_progress(conn, command, on_commit):
+    """
+    Goal progress for an exercise, or progress through a routine when 'routine' is given.
+    """
+
+    if 'routine' not in command:
+        exercise = str(get_command_value(command, 'exercise'))
+        completed_reps = get_command_integer(command, 'completed')
+
+        goal_data = conn.execute("SELECT GoalType, GoalValue FROM goals.Goals WHERE Exercise = ?", (exercise,)).fetchone()
+        if not goal_data:
+            raise ValueError(f"No goal set for {exercise}.")
+
+        goal_type, goal_value = goal_data
+        return {'exercise': exercise,
+                'goal_type': goal_type,
+                'goal_value': goal_value,
+                'completed_reps': completed_reps,
+                'remaining_reps': goal_value - completed_reps,
+                'completion_percentage': round((completed_reps / goal_value) * 100, 2)}
+
+    routine_name = str(command['routine'])
+    completed = get_command_value(command, 'completed')
+    if not isinstance(completed, dict):
+        raise ValueError("'completed' must map exercise names to completed reps")
+
+    if not conn.execute("SELECT 1 FROM routines.sqlite_master WHERE type='table' AND name = ?", (routine_name,)).fetchone():
+        raise ValueError(f"Routine '{routine_name}' not found.")
+
+    # Same figures as view_exercise_progress, exercises missing from 'completed' count as 0 reps
+    exercises = {}
+    progress = []
+    for exercise, reps, sets in conn.execute(f"SELECT Exercise, MAX(Reps), MAX(Sets) FROM routines.{routine_name} GROUP BY Exercise").fetchall():
+        if not reps or not sets:
+            raise ValueError(f"Exercise '{exercise}' has no reps or sets to make progress on.")
+
+        completed_reps = get_command_integer(completed, exercise) if exercise in completed else 0
+        remaining_sets, remaining_reps, completion_percentage = calculate_exercise_progress(completed_reps, reps, sets)
+        exercises[exercise] = {'completed_reps': completed_reps,
+                               'remaining_sets': remaining_sets,
+                               'remaining_reps': remaining_reps,
+                               'completion_percentage': completion_percentage}
+        progress.append((completed_reps, reps, sets))
+
+    return {'routine': routine_name, 'exercises': exercises, 'overall_completion': calculate_overall_completion(progress)}
+
+# op -> (entity the command writes to, handler)
+batch_commands = {
+    'add-exercise': ('exercises', batch_add_exercise),
+    'create-routine': ('routines', batch_create_routine),
+    'set-goal': ('goals', batch_set_goal),
+    'progress': (None, batch_progress)}
+
+def run_batch_command(conn, line, on_commit):
+    """
+    Parses and runs one command, undoing its partial writes if it fails.
+
+    Returns:
+        tuple: (result dict, entity written to or None)
+    """
+
+    try:
+        command = json.loads(line)
+        if not isinstance(command, dict):
+            raise ValueError("Command must be a JSON object")
+        op = command.get('op')
+        if op not in batch_commands:
+            raise ValueError(f"Unknown op '{op}'. Choose from: {', '.join(batch_commands)}")
+    except ValueError as e:
+        return {'ok': False, 'error': str(e)}, None
+
+    entity, handler = batch_commands[op]
+    command_on_commit = []
+    try:
+        conn.execute("SAVEPOINT batch_command")
+        result = handler(conn, command, command_on_commit)
+        conn.execute("RELEASE batch_command")
+    except (ValueError, OverflowError, sqlite3.Error) as e:
+        conn.execute("ROLLBACK TO batch_command")
+        conn.execute("RELEASE batch_command")
+        return {'op': op, 'ok': False, 'error': str(e)}, None
+
+    on_commit.extend(command_on_commit)
+    return {'op': op, 'ok': True, 'result': result}, entity
+
+def run_batch(stream, output, batch_size=BATCH_SIZE):
+    """
+    Runs batch commands, committing every batch_size commands as one transaction
+    across all the databases, change journal included.
+
+    Args:
+        stream (iterable): Lines of JSON commands. Blank lines and lines starting with # are skipped.
+        output (file): Where the JSON result lines are written.
+        batch_size (int, optional): Commands per transaction. Defaults to BATCH_SIZE.
+
+    Returns:
+        tuple: (number of commands run, number that failed)
+    """
+
+    conn = connect_all_databases()
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS goals.goals (
+            Exercise TEXT PRIMARY KEY,
+            GoalType TEXT,
+            GoalValue INT
+        )
+    ''')
+
+    total = failed = 0
+    results = []
+    on_commit = []
+    touched = set()
+
+    def commit_group():
+        conn.commit()
+        for entity in touched:
+            bump_entity_version(entity)
+        for action in on_commit:
+            action()
+        # Results are only written once the work they describe is committed
+        output.write("".join(json.dumps(result) + "\n" for result in results))
+        output.flush()
+        results.clear()
+        on_commit.clear()
+        touched.clear()
+
+    try:
+        for line_number, line in enumerate(stream, 1):
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+
+            if not conn.in_transaction:
+                conn.execute("BEGIN")
+
+            result, entity = run_batch_command(conn, line, on_commit)
+            result['line'] = line_number
+            results.append(result)
+            total += 1
+            if not result['ok']:
+                failed += 1
+            if entity:
+                touched.add(entity)
+
+            if len(results) >= batch_size:
+                commit_group()
+
+        commit_group()
+
+    except BaseException:
+        conn.rollback()
+        raise
+
+    finally:
+        conn.close()
+
+    return total, failed
+
 #--- Menu ---#
 
 def menu():
@@ -711,10 +1793,12 @@ def menu():
         8 - Set Fitness Goals
         9 - View Progress towards Fitness Goals
         10 - Delete Fitness Goals
+        11 - Start JSON HTTP Server
+        12 - Check Data Consistency
         0 - Quit
         : ''')
 
-        if menu not in ['1', '2', '3', '4', '5', '6', '7', '8', '9', '10', '0', ]:
+        if menu not in ['1', '2', '3', '4', '5', '6', '7', '8', '9', '10', '11', '12', '0', ]:
             print("\nInvalid input. Please select from the available list.")
             continue
 
@@ -753,8 +1837,64 @@ def menu():
         if menu == '10':
             delete_fitness_goals()
 
+        if menu == '11':
+            global http_server
+            if http_server:
+                print(f"The HTTP server is already running on port {http_server.server_port}.")
+                continue
+            port = get_valid_integer("Enter the port to serve on (e.g. 8000): ")
+            try:
+                http_server = start_http_server(port)
+                print(f"Serving JSON on http://127.0.0.1:{http_server.server_port}/ (exercises, routines, goals, progress)")
+            except OSError as e:
+                print(f"Could not start the HTTP server: {e}")
+
+        if menu == '12':
+            repair = input("Delete any orphaned routine entries or goals that are found? (y/n): ").lower() == 'y'
+            try:
+                report = check_consistency(repair=repair)
+            except sqlite3.Error as e:
+                print(f"An error occurred while checking the databases: {e}")
+                continue
+
+            print(f"\nChecked {report['checked']} routine entries and goals.")
+            if report['orphans']:
+                print("Entries for exercises that no longer exist:")
+                for table, exercise in report['orphans']:
+                    print(f"- {exercise} in {table.split('.', 1)[1]}")
+                if repair:
+                    print(f"{report['repaired']} entries deleted.")
+            else:
+                print("No problems found.")
+
         if menu == '0':
             print('\nGoodluck with your fitness journey. Until next time!')
             exit()
 
-menu()
\ No newline at end of file
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="A simple fitness app storing exercises with reps and sets")
+    parser.add_argument('--serve', type=int, metavar='PORT', help="only run the JSON HTTP server on PORT")
+    parser.add_argument('--check-interval', type=float, metavar='SECONDS', help="with --serve, repair orphaned entries in the background")
+    parser.add_argument('--batch', metavar='FILE', help="run JSON line commands from FILE ('-' for stdin) instead of the menu")
+    parser.add_argument('--batch-size', type=int, default=BATCH_SIZE, metavar='N', help="commands per transaction in batch mode")
+    args = parser.parse_args()
+
+    if args.batch is not None:
+        if args.batch == '-':
+            total, failed = run_batch(sys.stdin, sys.stdout, args.batch_size)
+        else:
+            with open(args.batch) as batch_file:
+                total, failed = run_batch(batch_file, sys.stdout, args.batch_size)
+        print(f"{total} commands run, {failed} failed.", file=sys.stderr)
+        sys.exit(1 if failed else 0)
+    elif args.serve is not None:
+        server = start_http_server(args.serve)
+        if args.check_interval:
+            start_consistency_checker(args.check_interval)
+        print(f"Serving JSON on http://127.0.0.1:{server.server_port}/ (Ctrl+C to stop)")
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            server.shutdown()
+    else:
+        menu()
\ No newline at end of file
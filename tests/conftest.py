@@ -0,0 +1,99 @@
+"""
+Shared fixtures for the basic_fitness_app tests.
+
+The app opens its databases under data/ on import, so it is imported once from a
+temporary working directory and the tables are emptied before every test.
+"""
+
+import importlib
+import io
+import json
+import os
+import sys
+import urllib.error
+import urllib.request
+
+import pytest
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture(scope='session')
+def fitness_app(tmp_path_factory):
+    workdir = tmp_path_factory.mktemp('fitness')
+    (workdir / 'data').mkdir()
+    previous_dir = os.getcwd()
+    os.chdir(workdir)
+    sys.path.insert(0, REPO_DIR)
+    try:
+        module = importlib.import_module('basic_fitness_app')
+        yield module
+        module.db.close()
+        module.routine_db.close()
+    finally:
+        sys.path.remove(REPO_DIR)
+        os.chdir(previous_dir)
+
+
+@pytest.fixture
+def app(fitness_app):
+    # The change journal is append-only, tests compare against get_latest_change_seq() instead
+    with fitness_app.all_databases_transaction() as conn:
+        conn.execute("DELETE FROM main.program")
+        for routine_name in fitness_app.get_routine_names():
+            conn.execute(f"DROP TABLE routines.{routine_name}")
+        conn.execute("DROP TABLE IF EXISTS goals.goals")
+    for entity in fitness_app.entity_versions:
+        fitness_app.bump_entity_version(entity)
+    fitness_app.consistency_position[:] = [None, 0]
+    fitness_app.response_cache.clear()
+    return fitness_app
+
+
+@pytest.fixture
+def server(app):
+    http_server = app.start_http_server(0)
+    yield http_server
+    http_server.shutdown()
+    http_server.server_close()
+
+
+@pytest.fixture
+def batch(app):
+    """
+    Runs JSON commands through run_batch and returns the parsed result lines.
+    """
+
+    def run(*commands, batch_size=500):
+        output = io.StringIO()
+        app.run_batch([json.dumps(command) for command in commands], output, batch_size)
+        return [json.loads(line) for line in output.getvalue().splitlines()]
+    return run
+
+
+@pytest.fixture
+def add_exercise():
+    """
+    Builds an add-exercise batch command.
+    """
+
+    def command(exercise, muscle_group, reps, sets):
+        return {'op': 'add-exercise', 'exercise': exercise, 'muscle_group': muscle_group, 'reps': reps, 'sets': sets}
+    return command
+
+
+@pytest.fixture
+def http_get(server):
+    """
+    GETs a path from the test server and returns (status, ETag, body).
+    """
+
+    def get(path, etag=None):
+        request = urllib.request.Request(f"http://127.0.0.1:{server.server_port}{path}",
+                                         headers={'If-None-Match': etag} if etag else {})
+        try:
+            with urllib.request.urlopen(request) as response:
+                return response.status, response.headers.get('ETag'), response.read()
+        except urllib.error.HTTPError as error:
+            return error.code, error.headers.get('ETag'), error.read()
+    return get
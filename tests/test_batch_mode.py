@@ -0,0 +1,31 @@
+"""
+Tests for batch mode.
+"""
+
+
+def test_batch_failures_are_undone_without_losing_the_group(app, batch, add_exercise):
+    results = batch(add_exercise('squat', 'legs', 10, 3),
+                    add_exercise('squat', 'legs', 10, 3),
+                    add_exercise('huge', 'legs', 99999999999999999999, 3),
+                    {'op': 'create-routine', 'routine': 'Legs', 'exercises': ['squat', 'missing']},
+                    {'op': 'create-routine', 'routine': 'Legs', 'exercises': ['Squat']},
+                    {'op': 'fly'},
+                    batch_size=2)
+
+    assert [result['ok'] for result in results] == [True, False, False, False, True, False]
+    assert [result['line'] for result in results] == [1, 2, 3, 4, 5, 6]
+    assert app.db.execute("SELECT Exercise FROM program").fetchall() == [('squat',)]
+    assert app.routine_db.execute("SELECT Exercise FROM Legs").fetchall() == [('squat',)]
+
+
+def test_batch_routine_progress_matches_the_menu(batch, add_exercise):
+    results = batch(add_exercise('squat', 'legs', 10, 3),
+                    add_exercise('plank', 'core', 3, 1),
+                    {'op': 'create-routine', 'routine': 'Mixed', 'exercises': ['squat', 'plank']},
+                    {'op': 'progress', 'routine': 'Mixed', 'completed': {'squat': 5, 'plank': 1}})
+
+    progress = results[-1]['result']
+    assert progress['exercises']['squat'] == {'completed_reps': 5, 'remaining_sets': 2, 'remaining_reps': 5, 'completion_percentage': 50.0}
+    assert progress['exercises']['plank']['completion_percentage'] == 33.33
+    # (5 / 30 + 1 / 3) / 2, worked out from the raw totals
+    assert progress['overall_completion'] == 25.0
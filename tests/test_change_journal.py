@@ -0,0 +1,80 @@
+"""
+Tests for the append-only change journal and the /changes endpoint.
+"""
+
+import json
+import sqlite3
+
+import pytest
+
+
+def test_changes_since_returns_the_delta_in_order(app, batch, add_exercise):
+    start = app.get_latest_change_seq()
+    batch(add_exercise('squat', 'legs', 10, 3),
+          {'op': 'create-routine', 'routine': 'Legs', 'exercises': ['missing']},
+          {'op': 'create-routine', 'routine': 'Legs', 'exercises': ['squat']},
+          {'op': 'set-goal', 'exercise': 'squat', 'reps': 100})
+    app.delete_exercise_cascade('squat')
+
+    changes = app.get_changes_since(start)
+    assert [(change['entity'], change['operation'], change['key']) for change in changes] == [
+        ('exercises', 'insert', 'squat'),
+        ('routines', 'create', 'Legs'),
+        ('routines', 'insert', 'Legs'),
+        ('goals', 'set', 'squat'),
+        ('exercises', 'delete', 'squat'),
+        ('goals', 'delete', 'squat'),
+        ('routines', 'delete', 'Legs')]
+    assert [change['seq'] for change in changes] == list(range(start + 1, start + 8))
+    assert app.get_changes_since(start + 5) == changes[5:]
+    assert app.get_changes_since(start, limit=2) == changes[:2]
+    assert app.get_latest_change_seq() == start + 7
+
+    journal = sqlite3.connect('data/change_log.db')
+    with pytest.raises(sqlite3.IntegrityError):
+        journal.execute("DELETE FROM change_log")
+    journal.close()
+
+
+def test_http_changes_reports_the_journal_head(app, batch, add_exercise, http_get):
+    batch(add_exercise('squat', 'legs', 10, 3))
+    head = app.get_latest_change_seq()
+
+    assert json.loads(http_get(f'/changes?since={head - 1}')[2])['latest_seq'] == head
+    assert json.loads(http_get(f'/changes?since={head + 10}')[2]) == {'changes': [], 'latest_seq': head}
+
+
+def test_http_changes_rejects_limits_below_one(app, batch, add_exercise, http_get):
+    batch(add_exercise('squat', 'legs', 10, 3))
+
+    assert http_get('/changes?since=0&limit=0')[0] == 400
+    assert http_get('/changes?since=0&limit=-1')[0] == 400
+    with pytest.raises(ValueError):
+        app.get_changes_since(0, limit=0)
+
+    # A partial page resumes after its last entry, not at the head
+    batch(add_exercise('press', 'shoulders', 8, 3))
+    head = app.get_latest_change_seq()
+    page = json.loads(http_get(f'/changes?since={head - 2}&limit=1')[2])
+    assert [change['key'] for change in page['changes']] == ['squat']
+    assert page['latest_seq'] == head - 1
+
+
+def test_routine_names_differing_only_in_case_are_the_same_routine(app, batch, add_exercise, monkeypatch, capsys):
+    start = app.get_latest_change_seq()
+    results = batch(add_exercise('squat', 'legs', 10, 3),
+                    add_exercise('row', 'back', 5, 2),
+                    {'op': 'create-routine', 'routine': 'Legs', 'exercises': ['squat']},
+                    {'op': 'create-routine', 'routine': 'legs', 'exercises': ['squat']})
+    assert results[-1]['result']['routine'] == 'Legs'
+
+    answers = iter(['LEGS', 'row', 'done'])
+    monkeypatch.setattr('builtins.input', lambda prompt: next(answers))
+    app.create_workout_routine()
+
+    changes = app.get_changes_since(start)
+    assert [(change['operation'], change['key']) for change in changes if change['entity'] == 'routines'] == [
+        ('create', 'Legs'), ('insert', 'Legs'), ('insert', 'Legs'), ('insert', 'Legs')]
+    assert app.get_routine_names() == ['Legs']
+    assert set(app.routine_volumes) == {'Legs'}
+    assert app.routine_volumes['Legs']['back'] == 10
@@ -0,0 +1,47 @@
+"""
+Tests for the JSON HTTP service and its response cache.
+"""
+
+import json
+
+
+def test_http_caches_responses_and_answers_if_none_match(app, batch, add_exercise, http_get, monkeypatch):
+    batch(add_exercise('squat', 'legs', 10, 3))
+
+    status, etag, body = http_get('/exercises')
+    assert status == 200
+    assert json.loads(body) == [{'exercise': 'squat', 'muscle_group': 'legs', 'reps': 10, 'sets': 3}]
+    assert etag
+
+    assert http_get('/exercises', etag)[0] == 304
+
+    # Repeated polling is served from the cache without reading the database
+    def fail(*args):
+        raise AssertionError("the database was queried")
+    monkeypatch.setattr(app, 'query_db', fail)
+    assert http_get('/exercises') == (200, etag, body)
+    monkeypatch.undo()
+
+    batch(add_exercise('press', 'shoulders', 8, 3))
+    status, new_etag, body = http_get('/exercises', etag)
+    assert status == 200
+    assert new_etag != etag
+    assert [exercise['exercise'] for exercise in json.loads(body)] == ['squat', 'press']
+
+
+def test_http_routines_goals_and_progress(batch, add_exercise, http_get):
+    batch(add_exercise('squat', 'legs', 10, 3),
+          {'op': 'create-routine', 'routine': 'Legs', 'exercises': ['squat']},
+          {'op': 'set-goal', 'exercise': 'squat', 'reps': 100})
+
+    assert json.loads(http_get('/routines')[2]) == ['Legs']
+    assert json.loads(http_get('/routines/Legs')[2])['exercises'][0]['exercise'] == 'squat'
+    assert json.loads(http_get('/goals')[2]) == [{'exercise': 'squat', 'goal_type': 'reps', 'goal_value': 100}]
+
+    progress = json.loads(http_get('/progress/squat?completed=40')[2])
+    assert progress['remaining_reps'] == 60
+    assert progress['completion_percentage'] == 40.0
+
+    assert http_get('/routines/Missing')[0] == 404
+    assert http_get('/progress/squat?completed=lots')[0] == 400
+    assert http_get('/unknown')[0] == 404
@@ -0,0 +1,59 @@
+"""
+Tests for the routine balance recommender.
+"""
+
+import sqlite3
+
+
+def test_recommendations_fill_the_gap_to_the_most_trained_group(app, batch, add_exercise):
+    batch(add_exercise('squat', 'legs', 10, 3),
+          add_exercise('lunge', 'legs', 10, 3),
+          add_exercise('pushup', 'chest', 10, 3),
+          add_exercise('bench', 'chest', 8, 5),
+          add_exercise('fly', 'chest', 15, 4),
+          add_exercise('row', 'back', 5, 2),
+          {'op': 'create-routine', 'routine': 'Legs', 'exercises': ['squat', 'lunge']})
+
+    # legs has 60, fly (60) closes the chest gap exactly, row (10) leaves 50 for back
+    assert app.recommend_exercises('Legs', limit=5) == [('fly', 'chest'), ('row', 'back')]
+
+
+def test_recommendations_follow_changes_made_elsewhere(app, batch, add_exercise):
+    batch(add_exercise('squat', 'legs', 10, 3),
+          add_exercise('row', 'back', 5, 2),
+          {'op': 'create-routine', 'routine': 'Legs', 'exercises': ['squat']})
+    assert app.recommend_exercises('Legs') == [('row', 'back')]
+
+    # Another process can't bump this one's counters, only the database file changes
+    workout = sqlite3.connect('data/workout_db.db')
+    workout.execute("DELETE FROM program WHERE Exercise = 'row'")
+    workout.commit()
+    workout.close()
+
+    assert app.recommend_exercises('Legs') == []
+
+
+def test_closest_exercise_skips_exercises_already_in_the_routine(app):
+    group_exercises = [(10, 'a'), (20, 'b'), (30, 'c'), (40, 'd'), (50, 'e')]
+
+    assert app.find_closest_exercise(group_exercises, 30, {}) == (30, 'c')
+    assert app.find_closest_exercise(group_exercises, 30, {'b': 1, 'c': 1}) == (40, 'd')
+    assert app.find_closest_exercise(group_exercises, 30, {'c': 1, 'd': 1, 'e': 1}) == (20, 'b')
+    assert app.find_closest_exercise(group_exercises, 100, {}) == (50, 'e')
+    assert app.find_closest_exercise(group_exercises, 0, {}) == (10, 'a')
+    assert app.find_closest_exercise(group_exercises, 30, dict.fromkeys('abcde', 1)) is None
+
+
+def test_deleting_a_zero_volume_exercise_takes_it_out_of_the_routine(app, batch, add_exercise, monkeypatch, capsys):
+    batch(add_exercise('squat', 'legs', 10, 3),
+          add_exercise('stretch', 'back', 0, 3),
+          {'op': 'create-routine', 'routine': 'Legs', 'exercises': ['squat', 'stretch']})
+    assert app.recommend_exercises('Legs') == []
+
+    answers = iter(['stretch', 'y'])
+    monkeypatch.setattr('builtins.input', lambda prompt: next(answers))
+    app.delete_exercise_category()
+    assert 'stretch' not in app.routine_exercises['Legs']
+
+    batch(add_exercise('stretch', 'back', 0, 3))
+    assert app.recommend_exercises('Legs') == [('stretch', 'back')]
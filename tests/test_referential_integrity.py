@@ -0,0 +1,46 @@
+"""
+Tests for cascade deletes and the incremental consistency checker.
+"""
+
+import sqlite3
+
+
+def test_delete_exercise_cascades_to_routines_and_goals(app, batch, add_exercise):
+    batch(add_exercise('squat', 'legs', 10, 3),
+          add_exercise('lunge', 'legs', 10, 3),
+          {'op': 'create-routine', 'routine': 'Legs', 'exercises': ['squat', 'lunge', 'squat']},
+          {'op': 'set-goal', 'exercise': 'squat', 'reps': 100})
+
+    removed_from_routines, goal_removed = app.delete_exercise_cascade('squat')
+
+    assert list(removed_from_routines) == ['Legs']
+    assert len(removed_from_routines['Legs']) == 2
+    assert goal_removed
+    assert app.routine_db.execute("SELECT Exercise FROM Legs").fetchall() == [('lunge',)]
+    assert app.get_goal_rows("SELECT * FROM Goals") == []
+
+
+def test_check_consistency_repairs_orphans_in_resumable_chunks(app, batch, add_exercise):
+    batch(add_exercise('squat', 'legs', 10, 3),
+          {'op': 'create-routine', 'routine': 'Legs', 'exercises': ['squat']})
+
+    # Orphans written behind the app's back, as an older version would have left them
+    routines = sqlite3.connect('data/routine_db.db')
+    routines.executemany("INSERT INTO Legs VALUES (?, 'legs', 1, 1)", [('gone',)] * 5)
+    routines.commit()
+    routines.close()
+
+    positions = []
+    repaired = 0
+    for _ in range(10):
+        report = app.check_consistency(chunk_size=2, max_chunks=1)
+        repaired += report['repaired']
+        positions.append(list(app.consistency_position))
+        if report['pass_complete']:
+            break
+
+    assert report['pass_complete']
+    assert repaired == 5
+    assert ['routines.Legs', 2] in positions
+    assert app.routine_db.execute("SELECT Exercise FROM Legs").fetchall() == [('squat',)]
+    assert app.check_consistency(repair=False)['orphans'] == []